@@ -1,9 +1,20 @@
 from __future__ import annotations
-from typing import Dict, Set
+from typing import Dict, Iterable, Iterator, Set
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+from functools import lru_cache
+from array import array
+from bisect import bisect_left
+from itertools import groupby, islice
 import re
 import csv
+import io
+import ast
+import hashlib
+import heapq
+import time
+import queue
+import threading
 
 # ------------------ OPTIONAL LIBS ------------------
 import subprocess
@@ -13,7 +24,9 @@ HAS_VENN = True
 HAS_PDF = True
 
 try:
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     from matplotlib_venn import venn2, venn3
 except:
     HAS_VENN = False
@@ -26,21 +39,197 @@ except:
     HAS_PDF = False
 
 
+# ------------------ ELEMENT STORAGE ------------------
+class ElementPool:
+    """Intern pool for the sets of one computation: every distinct element is stored once and gets an int ID."""
+    __slots__ = ("ids", "strings", "str_bytes")
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: list[str] = []
+        self.str_bytes = 0  # running total, so nbytes() does not walk every string
+
+    def intern(self, el: str) -> str:
+        return self.strings[self.id_of(el)]
+
+    def id_of(self, el: str) -> int:
+        i = self.ids.get(el)
+        if i is None:
+            i = len(self.strings)
+            self.strings.append(el)
+            self.ids[el] = i
+            self.str_bytes += sys.getsizeof(el)
+        return i
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.ids) + sys.getsizeof(self.strings) + self.str_bytes
+
+
+def merge_sorted_ids(a: array, b: array, keep_a: bool, keep_b: bool, keep_both: bool) -> Iterator[int]:
+    """Linear merge of two sorted ID arrays; the flags pick which of the three parts are yielded."""
+    i = j = 0
+    na, nb = len(a), len(b)
+    while i < na and j < nb:
+        x, y = a[i], b[j]
+        if x < y:
+            if keep_a:
+                yield x
+            i += 1
+        elif y < x:
+            if keep_b:
+                yield y
+            j += 1
+        else:
+            if keep_both:
+                yield x
+            i += 1
+            j += 1
+    if keep_a:
+        yield from islice(a, i, None)
+    if keep_b:
+        yield from islice(b, j, None)
+
+
+class CompactSet:
+    """Immutable set stored as a sorted array of pool IDs (4 bytes per element instead of a hash slot)."""
+    __slots__ = ("pool", "ids")
+
+    def __init__(self, elements: Iterable[str], pool: ElementPool):
+        self.pool = pool
+        ids = sorted(pool.id_of(x) for x in elements)
+        self.ids = array("I", (k for k, _ in groupby(ids)))
+
+    @classmethod
+    def _from_ids(cls, ids: Iterable[int], pool: ElementPool) -> CompactSet:
+        """ids must already be sorted and unique (the output of merge_sorted_ids)."""
+        obj = cls.__new__(cls)
+        obj.pool = pool
+        obj.ids = array("I", ids)
+        return obj
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        strings = self.pool.strings
+        return (strings[i] for i in self.ids)
+
+    def __contains__(self, el):
+        i = self.pool.ids.get(el)
+        if i is None:
+            return False
+        pos = bisect_left(self.ids, i)
+        return pos < len(self.ids) and self.ids[pos] == i
+
+    def __eq__(self, other):
+        if isinstance(other, CompactSet):
+            return self.pool is other.pool and self.ids == other.ids
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactSet({sorted(self)})"
+
+    def _same_pool(self, other: CompactSet):
+        # IDs are only comparable within one pool
+        if other.pool is not self.pool:
+            raise ValueError("CompactSet operands come from different ElementPools")
+
+    def _merge(self, other, keep_a: bool, keep_b: bool, keep_both: bool):
+        if not isinstance(other, CompactSet):
+            return NotImplemented
+        self._same_pool(other)
+        return CompactSet._from_ids(merge_sorted_ids(self.ids, other.ids, keep_a, keep_b, keep_both), self.pool)
+
+    def issubset(self, other) -> bool:
+        if not isinstance(other, CompactSet):
+            return all(el in other for el in self)
+        self._same_pool(other)
+        if len(self.ids) > len(other.ids):
+            return False
+        return next(merge_sorted_ids(self.ids, other.ids, True, False, False), None) is None
+
+    def __or__(self, other):
+        return self._merge(other, True, True, True)
+
+    def __and__(self, other):
+        return self._merge(other, False, False, True)
+
+    def __sub__(self, other):
+        return self._merge(other, True, False, False)
+
+    def __xor__(self, other):
+        return self._merge(other, True, True, False)
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.ids)
+
+
+def memory_usage(s) -> int:
+    """Container size in bytes; element strings live in the shared pool and are counted there."""
+    if isinstance(s, CompactSet):
+        return s.nbytes()
+    return sys.getsizeof(s)
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
 # ------------------ SET LOGIC ------------------
-def parse_set_input(raw: str) -> Set[str]:
+def tokenize_set_input(raw: str) -> Iterator[str]:
     raw = raw.replace("{", "").replace("}", "")
-    return set(x.strip() for x in raw.replace(",", " ").split() if x.strip())
+    return (x.strip() for x in raw.replace(",", " ").split() if x.strip())
 
 
-def evaluate_expression(expr: str, sets: Dict[str, Set[str]]) -> Set[str]:
+def parse_set_input(raw: str, pool: ElementPool | None = None) -> Set[str]:
+    if pool is None:
+        return set(tokenize_set_input(raw))
+    return set(pool.intern(x) for x in tokenize_set_input(raw))
+
+
+@lru_cache(maxsize=128)
+def translate_expression(expr: str, labels: tuple) -> str:
+    """Translates the set symbols to Python operators on sets['X']."""
     expr = expr.replace("∪", "|").replace("∩", "&").replace("\\", "-").replace("Δ", "^")
-    for k in sets:
+    for k in labels:
         expr = re.sub(rf"\b{k}\b", f"sets['{k}']", expr)
-    return eval(expr)
+    return expr
+
+
+@lru_cache(maxsize=128)
+def compile_expression(expr: str, labels: tuple):
+    """Compiles the translated expression once per (expr, labels)."""
+    return compile(translate_expression(expr, labels), "<shprehja>", "eval")
+
+
+def evaluate_expression(expr: str, sets: Dict[str, Set[str]]) -> Set[str]:
+    return eval(compile_expression(expr, tuple(sets)), {"sets": sets})
 
 
-def build_membership_table(sets: Dict[str, Set[str]], result: Set[str]) -> str:
-    universe = set().union(*sets.values()) | result
+def active_regions(expr: str, labels: list[str]) -> list[str]:
+    """Returns the region bitmasks (e.g. "10", "011") that belong to the expression result."""
+    regions = []
+    n = len(labels)
+    for mask in range(1, 2 ** n):
+        rid = format(mask, f"0{n}b")
+        test_sets = {l: ({"x"} if bit == "1" else set()) for l, bit in zip(labels, rid)}
+        try:
+            if "x" in evaluate_expression(expr, test_sets):
+                regions.append(rid)
+        except Exception:
+            return []
+    return regions
+
+
+def build_membership_table(sets: Dict[str, Set[str]], result: Set[str], limit: int | None = None,
+                           regions: list[str] | None = None, rows: list[str] | None = None) -> str:
+    """With regions (active bitmasks) the R column is derived from set membership,
+    so it stays exact when result holds only part of R. rows, when given, are used as-is
+    (callers with a time budget pick them with first_rows)."""
     labels = list(sets.keys())
 
     header = "El".ljust(6)
@@ -49,29 +238,485 @@ def build_membership_table(sets: Dict[str, Set[str]], result: Set[str]) -> str:
     header += "R".center(5)
 
     lines = [header, "-" * len(header)]
-    for el in sorted(universe):
+    sources = list(sets.values()) if regions is not None else [*sets.values(), result]
+    if rows is not None:
+        pass
+    elif limit is None:
+        rows = sorted(set().union(*sources))
+    else:
+        # Only the first rows are needed: no full union / sort
+        rows = heapq.nsmallest(limit, iter_universe(sources))
+    set_list = list(sets.values())
+    active = set(regions) if regions is not None else None
+    for el in rows:
         row = el.ljust(6)
         for l in labels:
             row += ("✓" if el in sets[l] else ".").center(5)
-        row += ("✓" if el in result else ".").center(5)
+        in_r = region_of(el, set_list) in active if active is not None else el in result
+        row += ("✓" if in_r else ".").center(5)
         lines.append(row)
 
     return "\n".join(lines)
 
 
+# ------------------ RESOURCE LIMITS ------------------
+# Rough upper bound used for sizing before anything is allocated
+BYTES_PER_ELEMENT = 64   # hash-set slot incl. resize headroom
+
+
+class EvaluationCancelled(Exception):
+    """Raised by the streamed path when the caller's cancel predicate fires."""
+
+
+class EvalLimits:
+    """Budgets for one evaluation; exceeding them degrades to paged or counting-only output.
+
+    max_rows is a separate, small budget for what is printed to the output panel."""
+    __slots__ = ("max_bytes", "max_seconds", "page_size", "max_rows")
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, max_seconds: float = 10.0,
+                 page_size: int = 1000, max_rows: int = 2000):
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.page_size = page_size  # 0 = counting only
+        self.max_rows = max_rows
+
+    @classmethod
+    def from_env(cls) -> EvalLimits:
+        """Reads MATHSET_MAX_MB, MATHSET_MAX_SECONDS, MATHSET_PAGE_SIZE and MATHSET_MAX_ROWS.
+
+        Each variable is checked on its own; an invalid one keeps its default."""
+        limits = cls()
+        for name, attr, convert, valid in ENV_LIMITS:
+            raw = os.environ.get(name)
+            if raw is None:
+                continue
+            try:
+                value = convert(raw)
+            except (ValueError, OverflowError):
+                value = None
+            if value is None or not valid(value):
+                print(f"WARNING: {name}={raw!r} is invalid, keeping default {getattr(limits, attr)}")
+                continue
+            setattr(limits, attr, value)
+        return limits
+
+
+# (variable, EvalLimits attribute, converter, range check)
+ENV_LIMITS = (
+    ("MATHSET_MAX_MB", "max_bytes", lambda v: int(float(v) * 1024 * 1024), lambda n: n > 0),
+    ("MATHSET_MAX_SECONDS", "max_seconds", float, lambda n: 0 < n < float("inf")),
+    ("MATHSET_PAGE_SIZE", "page_size", int, lambda n: n >= 0),
+    ("MATHSET_MAX_ROWS", "max_rows", int, lambda n: n > 0),
+)
+
+# Read once at import, so invalid values are reported once
+DEFAULT_LIMITS = EvalLimits.from_env()
+
+
+class BoundedResult:
+    """Outcome of evaluate_bounded.
+
+    elements is the whole of R only when mode == "full"; in "paged" mode it is the
+    first page, in "count" mode it is empty. regions (active bitmasks) give exact
+    R membership for any element regardless of mode."""
+    __slots__ = ("elements", "mode", "count", "complete", "estimate", "regions", "notes")
+
+    def __init__(self, elements, mode: str, count: int, complete: bool, estimate: int,
+                 regions: list[str], notes: list[str]):
+        self.elements = elements
+        self.mode = mode
+        self.count = count
+        self.complete = complete
+        self.estimate = estimate
+        self.regions = regions
+        self.notes = notes
+
+    @property
+    def is_full(self) -> bool:
+        return self.mode == "full"
+
+    def count_text(self) -> str:
+        return str(self.count) if self.complete else f"të paktën {self.count}"
+
+
+def expression_bounds(expr: str, sets: Dict[str, Set[str]]) -> tuple[int, int]:
+    """Upper bounds (|R|, sum of all intermediate results) from the input cardinalities only."""
+    total = sum(len(s) for s in sets.values())
+    tree = ast.parse(translate_expression(expr, tuple(sets)), mode="eval")
+    intermediate = 0
+
+    def bound(node) -> int:
+        nonlocal intermediate
+        if isinstance(node, ast.BinOp):
+            a, b = bound(node.left), bound(node.right)
+            if isinstance(node.op, ast.BitAnd):
+                n = min(a, b)
+            elif isinstance(node.op, ast.Sub):
+                n = a
+            else:  # | and ^
+                n = min(a + b, total)
+            intermediate += n
+            return n
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+            return len(sets[node.slice.value])
+        intermediate += total
+        return total
+
+    return bound(tree.body), intermediate
+
+
+def iter_universe(set_list: list) -> Iterator[str]:
+    """Yields every element of the union once, without materialising the union."""
+    for i, s in enumerate(set_list):
+        earlier = set_list[:i]
+        for el in s:
+            if not any(el in e for e in earlier):
+                yield el
+
+
+def first_rows(set_list: list, limit: int, deadline: float | None = None,
+               cancelled=None) -> tuple[list[str], bool]:
+    """The `limit` smallest elements of the union, scanned lazily.
+
+    Returns (rows, cut); cut is True when the deadline stopped the scan early.
+    Raises EvaluationCancelled when cancelled() is true."""
+    cut = False
+
+    def guarded():
+        nonlocal cut
+        for n, el in enumerate(iter_universe(set_list)):
+            if n % 4096 == 0:
+                if cancelled is not None and cancelled():
+                    raise EvaluationCancelled
+                if deadline is not None and time.monotonic() > deadline:
+                    cut = True
+                    return
+            yield el
+
+    return heapq.nsmallest(limit, guarded()), cut
+
+
+def region_of(el: str, set_list: list) -> str:
+    return "".join("1" if el in s else "0" for s in set_list)
+
+
+def stream_result(expr: str, sets: Dict[str, Set[str]], limits: EvalLimits,
+                  cancelled=None) -> tuple[list[str], int, bool]:
+    """Per-element evaluation via region bitmasks: keeps only the first page, counts the rest.
+
+    Returns (sorted page, count, timed_out); raises EvaluationCancelled when cancelled() is true."""
+    set_list = list(sets.values())
+    active = set(active_regions(expr, list(sets)))
+    deadline = time.monotonic() + limits.max_seconds
+    count = 0
+    timed_out = False
+
+    def matches():
+        nonlocal count, timed_out
+        for n, el in enumerate(iter_universe(set_list)):
+            if n % 4096 == 0:
+                if cancelled is not None and cancelled():
+                    raise EvaluationCancelled
+                if time.monotonic() > deadline:
+                    timed_out = True
+                    return
+            if region_of(el, set_list) in active:
+                count += 1
+                yield el
+
+    if limits.page_size > 0:
+        page = heapq.nsmallest(limits.page_size, matches())
+    else:
+        page = []
+        for _ in matches():
+            pass
+    return page, count, timed_out
+
+
+def evaluate_bounded(expr: str, sets: Dict[str, Set[str]], limits: EvalLimits = DEFAULT_LIMITS,
+                     cancelled=None) -> BoundedResult:
+    """Evaluates within the memory/time budget of limits; notes say what was cut."""
+    # Surface syntax / name errors before any sizing
+    evaluate_expression(expr, {k: set() for k in sets})
+
+    estimate, intermediate = expression_bounds(expr, sets)
+    regions = active_regions(expr, list(sets))
+
+    if intermediate * BYTES_PER_ELEMENT <= limits.max_bytes:
+        result = evaluate_expression(expr, sets)
+        return BoundedResult(result, "full", len(result), True, estimate, regions, [])
+
+    page, count, timed_out = stream_result(expr, sets, limits, cancelled)
+    mode = "paged" if limits.page_size > 0 else "count"
+    notes = [
+        f"Vlerësimi (~{estimate} elemente, ~{format_bytes(intermediate * BYTES_PER_ELEMENT)}) "
+        f"tejkalon buxhetin e memories ({format_bytes(limits.max_bytes)})."
+    ]
+    if timed_out:
+        notes.append(f"Koha maksimale ({limits.max_seconds:g}s) u tejkalua: numërimi është i pjesshëm.")
+    if mode == "paged" and timed_out:
+        notes.append(f"Ruhen {len(page)} elemente të R vetëm nga pjesa e skanuar.")
+    elif mode == "paged":
+        notes.append(f"Ruhen vetëm {len(page)} elementet e para të R (nga {count}).")
+    else:
+        notes.append("Vetëm numërim: elementet e R nuk ruhen.")
+    return BoundedResult(set(page), mode, count, not timed_out, estimate, regions, notes)
+
+
+# ------------------ VENN RENDERING ------------------
+VENN_FIGSIZE = {2: (8, 7), 3: (9, 8), 4: (10, 10)}
+VENN_IMAGE_CACHE_SIZE = 32
+_venn_image_cache: Dict[tuple, bytes] = {}
+# Above this many elements a region label / legend shows the count instead of the elements
+VENN_LABEL_MAX_ELEMENTS = 30
+
+
+def venn_members_text(elems, sep: str) -> str:
+    if len(elems) > VENN_LABEL_MAX_ELEMENTS:
+        return f"{len(elems)} elemente"
+    return sep.join(sorted(elems))
+
+
+def sets_digest(sets: Dict[str, Set[str]]) -> str:
+    """Digest of the sorted elements per label; a small cache key in place of set copies."""
+    h = hashlib.sha1()
+    for k, v in sets.items():
+        h.update(k.encode("utf-8") + b"\x00")
+        for el in sorted(v):
+            h.update(el.encode("utf-8") + b"\x00")
+        h.update(b"\x01")
+    return h.hexdigest()
+
+# Ellipse definitions for 4 sets: (center, width, height, angle)
+VENN4_ELLIPSES = [
+    ((4.0, 5.0), 3.8, 7.8, 35),  # A
+    ((6.0, 5.0), 3.8, 7.8, -35), # B
+    ((4.0, 5.8), 3.8, 7.8, 35),  # C
+    ((6.0, 5.8), 3.8, 7.8, -35)  # D
+]
+VENN4_COLORS = ['#ff4d4d', '#4dff4d', '#4d4dff', '#ffb347']
+# Region Markers (Gold buttons for result-active areas)
+VENN4_CENTERS = {
+    "1000": (1.8, 3.8), "0100": (8.2, 3.8), "0010": (1.8, 7.2), "0001": (8.2, 7.2),
+    "1100": (5.0, 1.8), "1010": (3.1, 5.5), "0101": (6.9, 5.5), "0011": (5.0, 9.2),
+    "1001": (4.3, 4.2), "0110": (5.7, 4.2), "1110": (3.8, 3.0), "1101": (6.2, 3.0),
+    "1011": (3.8, 8.0), "0111": (6.2, 8.0), "1111": (5.0, 5.5)
+}
+
+
+@lru_cache(maxsize=1)
+def venn4_masks():
+    """High-res grid masks for the 4 ellipses; they only depend on geometry, so computed once."""
+    import numpy as np
+    res = 400
+    gx = np.linspace(0, 10, res)
+    gy = np.linspace(0, 10, res)
+    X, Y = np.meshgrid(gx, gy)
+
+    def get_mask(center, w, h, angle_deg):
+        ang = np.radians(angle_deg)
+        cx, cy = center
+        a, b = w/2, h/2
+        dx, dy = X - cx, Y - cy
+        rx = dx * np.cos(ang) + dy * np.sin(ang)
+        ry = -dx * np.sin(ang) + dy * np.cos(ang)
+        return (rx**2 / a**2 + ry**2 / b**2) <= 1
+
+    return {l: get_mask(*p) for l, p in zip(["A", "B", "C", "D"], VENN4_ELLIPSES)}
+
+
+def draw_venn_figure(fig, sets: Dict[str, Set[str]], expr: str) -> dict:
+    """Draws the diagram on fig and returns the artists that depend on the expression."""
+    labels_list = list(sets)
+    n = len(labels_list)
+    ax = fig.add_subplot(111)
+    state = {"labels": labels_list, "patches": {}, "markers": {}}
+
+    # -------- 2 / 3 BASHKËSI --------
+    if n in (2, 3):
+        if n == 2:
+            A, B = sets["A"], sets["B"]
+            v = venn2([A, B], set_labels=labels_list, ax=ax)
+            regions_map = {"10": A - B, "01": B - A, "11": A & B}
+        else:
+            v = venn3([sets[l] for l in labels_list], set_labels=labels_list, ax=ax)
+            universe = set().union(*sets.values())
+            regions_map = {}
+            for rid in ["100", "010", "110", "001", "101", "011", "111"]:
+                # Calculate precise region elements
+                curr = universe.copy()
+                for i, bit in enumerate(rid):
+                    s = sets[labels_list[i]]
+                    curr = (curr & s) if bit == '1' else (curr - s)
+                regions_map[rid] = curr
+
+        for rid, elems in regions_map.items():
+            patch = v.get_patch_by_id(rid)
+            label = v.get_label_by_id(rid)
+            if label: label.set_text(venn_members_text(elems, "\n") if elems else "")
+            if patch:
+                state["patches"][rid] = (patch, patch.get_edgecolor(), patch.get_linewidth())
+        state["title"] = ax.set_title("", pad=20)
+
+    # -------- 4 BASHKËSI (SHADED AREAS) --------
+    elif n == 4:
+        import numpy as np
+        from matplotlib.patches import Ellipse
+        ax.set_aspect('equal')
+        ax.axis('off')
+
+        # The result area is shaded in Gold through an RGBA image updated in place
+        res = venn4_masks()["A"].shape
+        state["image"] = ax.imshow(np.zeros(res + (4,)), extent=(0, 10, 0, 10),
+                                   origin='lower', interpolation='nearest')
+        ax.set_xlim(0, 10); ax.set_ylim(0, 10)
+
+        # Draw set outlines
+        for i, p in enumerate(VENN4_ELLIPSES):
+            # Light fill
+            ax.add_patch(Ellipse(p[0], p[1], p[2], angle=p[3], fc=VENN4_COLORS[i], alpha=0.1))
+            # Thick border
+            ax.add_patch(Ellipse(p[0], p[1], p[2], angle=p[3], ec=VENN4_COLORS[i], fc='none', lw=2.5, zorder=10))
+
+        # Color-coded Legend at the top left
+        for i, l in enumerate(labels_list):
+            members = venn_members_text(sets[l], ", ")
+            ax.text(0.2, 9.8 - i*0.4, f"Bashkësia {l}: {{{members}}}",
+                    color=VENN4_COLORS[i], weight='bold', fontsize=9, ha='left', transform=ax.transData)
+
+        for bits, pos in VENN4_CENTERS.items():
+            dot, = ax.plot(pos[0], pos[1], 'o', color='gold', markersize=14, markeredgecolor='black', zorder=15)
+            txt = ax.text(pos[0], pos[1], "R", ha='center', va='center', weight='bold', fontsize=8, zorder=16)
+            state["markers"][bits] = (dot, txt)
+        state["title"] = ax.set_title("", fontsize=14, pad=40)
+
+    update_venn_expression(state, expr)
+    return state
+
+
+def update_venn_expression(state: dict, expr: str):
+    """Re-highlights an already drawn diagram for a new expression (no redraw of the sets)."""
+    labels = state["labels"]
+    n = len(labels)
+    active = set(active_regions(expr, labels)) if expr else set()
+
+    for rid, (patch, edgecolor, linewidth) in state["patches"].items():
+        if rid in active:
+            patch.set_alpha(0.8)
+            patch.set_edgecolor('black')
+            patch.set_linewidth(2)
+        else:
+            patch.set_alpha(0.2)
+            patch.set_edgecolor(edgecolor)
+            patch.set_linewidth(linewidth)
+
+    if n == 4:
+        import numpy as np
+        masks = venn4_masks()
+        # Convert expression to numpy-compatible bitwise logic
+        # Union: |, Intersection: &, SymDiff: ^, Diff: \ -> & ~
+        clean_expr = expr.replace("∪", "|").replace("∩", "&").replace("Δ", "^").replace("\\", "& ~")
+        for k in masks:
+            clean_expr = re.sub(rf"\b{k}\b", f"masks['{k}']", clean_expr)
+        shape = masks["A"].shape
+        try:
+            result_mask = np.asarray(eval(clean_expr, {"masks": masks}), dtype=bool)
+            if result_mask.shape != shape:
+                raise ValueError
+        except:
+            result_mask = np.zeros(shape, dtype=bool)
+
+        rgba = np.zeros(shape + (4,))
+        rgba[result_mask] = (1.0, 0.843, 0.0, 0.5)  # #FFD700
+        state["image"].set_data(rgba)
+
+        for bits, (dot, txt) in state["markers"].items():
+            dot.set_visible(bits in active)
+            txt.set_visible(bits in active)
+        state["title"].set_text(f"Rezultati i Shprehjes: {expr}")
+    else:
+        state["title"].set_text(f"Diagrami i Vennit ({n} bashkësi):\n{expr}")
+
+
+def mark_venn_stale(state: dict):
+    """The sets behind an embedded diagram changed: say so instead of showing old highlights."""
+    state["title"].set_text("Diagrami nuk është i përditësuar: bashkësitë kanë ndryshuar.\n"
+                            "Shtyp 'Diagram Venn' për ta rifreskuar.")
+
+
+def render_venn_image(sets: Dict[str, Set[str]], expr: str, fmt: str = "png",
+                      digest: str | None = None) -> bytes:
+    """Headless (Agg) rendering to PNG/SVG bytes, LRU-cached by sets digest plus expression.
+
+    Pass digest when the caller already has sets_digest(sets) for this computation."""
+    key = (digest or sets_digest(sets), expr, fmt)
+    data = _venn_image_cache.pop(key, None)
+    if data is None:
+        fig = Figure(figsize=VENN_FIGSIZE[len(sets)])
+        FigureCanvasAgg(fig)
+        draw_venn_figure(fig, {k: set(v) for k, v in sets.items()}, expr)
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt)
+        data = buf.getvalue()
+        if len(_venn_image_cache) >= VENN_IMAGE_CACHE_SIZE:
+            _venn_image_cache.pop(next(iter(_venn_image_cache)))
+    # Re-inserted on every use: the first key is always the least recently used
+    _venn_image_cache[key] = data
+    return data
+
+
+VENN_IMAGE_FORMATS = ("png", "svg")
+
+
+def save_venn_image(path: str, sets: Dict[str, Set[str]], expr: str):
+    fmt = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+    if fmt not in VENN_IMAGE_FORMATS:
+        raise ValueError(f"Formati '{fmt}' nuk mbështetet (vetëm PNG/SVG)")
+    with open(path, "wb") as f:
+        f.write(render_venn_image(sets, expr, fmt))
+
+
 # ------------------ GUI APP ------------------
+LIVE_DEBOUNCE_MS = 300
+LIVE_PREVIEW_ROWS = 15
+LIVE_CACHE_SIZE = 4
+
+
 class SetApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, limits: EvalLimits | None = None):
         self.root = root
         self.root.title("Projekt inteligjent për bashkësi – Expression Builder")
         self.root.geometry("1050x700")
 
         self.num_sets_var = tk.IntVar(value=2)
         self.expr_var = tk.StringVar()
+        self.compact_var = tk.BooleanVar(value=False)
 
         self.set_entries: Dict[str, tk.Entry] = {}
+        self.set_vars: Dict[str, tk.StringVar] = {}
         self.current_sets: Dict[str, Set[str]] = {}
         self.current_result: Set[str] = set()
+        self.current_eval: BoundedResult | None = None  # says whether current_result is all of R
+        self.current_digest: str | None = None  # sets_digest(current_sets), computed on demand
+        self.pool = ElementPool()
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
+
+        # Live mode state: pending debounce timer, generation counter for stale jobs
+        self.live_var = tk.BooleanVar(value=False)
+        self.live_after_id = None
+        self.live_generation = 0
+        self.live_thread = None
+        self.live_queue: queue.Queue = queue.Queue()
+        self.live_cache: Dict[tuple, BoundedResult] = {}
+        self.live_parsed: Dict[str, tuple[str, frozenset]] = {}  # label -> (last raw text, parsed set)
+        self.expr_var.trace_add("write", self.schedule_live)
+
+        # Embedded Venn diagram, created on first use and reused afterwards
+        self.venn_figure = None
+        self.venn_canvas = None
+        self.venn_state: dict = {}
+        self.venn_key = None
 
         self.build_ui()
 
@@ -88,6 +733,7 @@ class SetApp:
         )
         cb.pack(side=tk.LEFT, padx=5)
         cb.bind("<<ComboboxSelected>>", lambda e: self.build_sets())
+        ttk.Checkbutton(top, text="Ruajtje kompakte", variable=self.compact_var).pack(side=tk.LEFT, padx=10)
 
         self.sets_frame = ttk.LabelFrame(self.root, text="Bashkësitë", padding=10)
         self.sets_frame.pack(fill=tk.X, padx=10)
@@ -103,9 +749,17 @@ class SetApp:
         ttk.Button(btns, text="Export TXT", command=self.export_txt).pack(side=tk.LEFT, padx=5)
         ttk.Button(btns, text="Export CSV", command=self.export_csv).pack(side=tk.LEFT, padx=5)
         ttk.Button(btns, text="Export PDF", command=self.export_pdf).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btns, text="Export Venn", command=self.export_venn).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(btns, text="Live", variable=self.live_var,
+                        command=self.schedule_live).pack(side=tk.LEFT, padx=5)
+
+        body = ttk.Frame(self.root)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.output = tk.Text(body, height=20)
+        self.output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        self.output = tk.Text(self.root, height=20)
-        self.output.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.venn_frame = ttk.Frame(body)
 
         self.build_sets()
         self.build_expression_builder()
@@ -116,17 +770,22 @@ class SetApp:
             w.destroy()
 
         self.set_entries.clear()
+        self.set_vars.clear()
         labels = ["A", "B", "C", "D"][:self.num_sets_var.get()]
 
         for lab in labels:
             row = ttk.Frame(self.sets_frame)
             row.pack(fill=tk.X, pady=2)
             ttk.Label(row, text=f"{lab} =").pack(side=tk.LEFT)
-            e = ttk.Entry(row)
+            var = tk.StringVar()
+            var.trace_add("write", self.schedule_live)
+            e = ttk.Entry(row, textvariable=var)
             e.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
             self.set_entries[lab] = e
+            self.set_vars[lab] = var
 
         self.build_expression_builder()
+        self.schedule_live()
 
     # ------------------ EXPRESSION BUILDER ------------------
     def build_expression_builder(self):
@@ -165,8 +824,35 @@ class SetApp:
 
     # ------------------ COMPUTE ------------------
     def read_sets(self):
-        self.current_sets = {k: parse_set_input(e.get())
-                             for k, e in self.set_entries.items()}
+        # A fresh pool per computation: it holds exactly the current elements, never stale tokens
+        self.pool = ElementPool()
+        self.current_result = set()
+        self.current_eval = None
+        self.current_digest = None
+        if self.compact_var.get():
+            self.current_sets = {k: CompactSet(tokenize_set_input(e.get()), self.pool)
+                                 for k, e in self.set_entries.items()}
+        else:
+            self.current_sets = {k: parse_set_input(e.get(), self.pool)
+                                 for k, e in self.set_entries.items()}
+
+    def sets_key(self) -> str:
+        """sets_digest of the current sets, computed once per computation."""
+        if self.current_digest is None:
+            self.current_digest = sets_digest(self.current_sets)
+        return self.current_digest
+
+    def memory_report(self) -> str:
+        lines = ["Memoria:"]
+        for k, v in self.current_sets.items():
+            lines.append(f"  {k}: {format_bytes(memory_usage(v))} ({len(v)} elemente)")
+        stored = f"{len(self.current_result)} elemente"
+        if self.current_eval is not None and not self.current_eval.is_full:
+            stored += f" të ruajtura nga {self.current_eval.count_text()}"
+        lines.append(f"  R: {format_bytes(memory_usage(self.current_result))} ({stored})")
+        lines.append(f"  Pool i përbashkët: {format_bytes(self.pool.nbytes())} "
+                     f"({len(self.pool.strings)} elemente unike)")
+        return "\n".join(lines) + "\n\n"
 
     def compute(self):
         self.output.delete("1.0", tk.END)
@@ -178,16 +864,56 @@ class SetApp:
             return
 
         try:
-            self.current_result = evaluate_expression(expr, self.current_sets)
+            res = evaluate_bounded(expr, self.current_sets, self.limits)
         except Exception as e:
             messagebox.showerror("Gabim", f"Gabim në llogaritje: {str(e)}")
             return
+        self.current_eval = res
+        self.current_result = res.elements
+
+        # The output panel has its own small budget (max_rows), independent of the evaluation one
+        max_rows = self.limits.max_rows
+        notes = list(res.notes)
 
         self.output.insert(tk.END, f"Shprehja:\n{expr}\n\nBashkësitë:\n")
         for k, v in self.current_sets.items():
-            self.output.insert(tk.END, f"{k} = {sorted(v)}\n")
-
-        self.output.insert(tk.END, f"\nRezultati:\nR = {sorted(self.current_result)}\n\n")
+            if len(v) <= max_rows:
+                self.output.insert(tk.END, f"{k} = {sorted(v)}\n")
+            else:
+                self.output.insert(tk.END, f"|{k}| = {len(v)}\n")
+
+        # Building the output gets its own deadline: the scans below touch every element
+        deadline = time.monotonic() + self.limits.max_seconds
+
+        self.output.insert(tk.END, f"\nRezultati:\n|R| = {res.count_text()}\n")
+        if res.elements:
+            shown, cut = first_rows([res.elements], max_rows, deadline)
+            suffix = "" if len(shown) == res.count else " ..."
+            self.output.insert(tk.END, f"R = {shown}{suffix}\n")
+            if cut:
+                notes.append(f"R: koha u tejkalua, shfaqen {len(shown)} elemente (jo domosdoshmërisht të parët).")
+            elif len(shown) < len(res.elements):
+                notes.append(f"R: shfaqen vetëm {len(shown)} elementet e para.")
+
+        universe_bound = sum(len(v) for v in self.current_sets.values())
+        table_rows = None
+        if not res.is_full:
+            # Rows come from the page the streamed pass already kept; no new universe scan
+            table_rows = sorted(res.elements)[:max_rows]
+            notes.append("Tabela e anëtarësisë tregon vetëm elementet e ruajtura të R."
+                         if table_rows else "Tabela e anëtarësisë nuk shfaqet: R nuk u ruajt.")
+        elif universe_bound > max_rows:
+            table_rows, cut = first_rows(list(self.current_sets.values()), max_rows, deadline)
+            notes.append(f"Tabela e anëtarësisë u kufizua në {max_rows} rreshtat e parë.")
+            if cut:
+                notes.append("Tabela: koha u tejkalua, rreshtat janë nga pjesa e skanuar.")
+
+        self.output.insert(tk.END, "\n")
+        for note in notes:
+            self.output.insert(tk.END, f"Kujdes: {note}\n")
+        if notes:
+            self.output.insert(tk.END, "\n")
+        self.output.insert(tk.END, self.memory_report())
 
         # -------- SUBSET CHECK (2 SETS) --------
         if len(self.current_sets) == 2:
@@ -200,22 +926,127 @@ class SetApp:
             elif B.issubset(A):
                 self.output.insert(tk.END, "Info: B është nënbashkësi e A (B ⊆ A)\n\n")
 
-        self.output.insert(tk.END, build_membership_table(self.current_sets, self.current_result))
-
-    # ------------------ UTILS ------------------
-    def evaluate_symbolic(self, rid: str, labels: list[str]) -> bool:
-        """Evaluates if a specific region (bitmask) is part of the result."""
-        test_sets = {l: set() for l in labels}
-        for i, bit in enumerate(rid):
-            if bit == '1':
-                test_sets[labels[i]].add("x")
-        
+        regions = None if res.is_full else res.regions
+        self.output.insert(tk.END, build_membership_table(self.current_sets, self.current_result,
+                                                          regions=regions, rows=table_rows))
+
+    # ------------------ LIVE MODE ------------------
+    def schedule_live(self, *_):
+        """Debounces keystrokes: only the last change within LIVE_DEBOUNCE_MS starts an evaluation."""
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        # Any new edit makes running jobs stale
+        self.live_generation += 1
+        if self.live_var.get():
+            self.live_after_id = self.root.after(LIVE_DEBOUNCE_MS, self.start_live)
+
+    def start_live(self):
+        self.live_after_id = None
         expr = self.expr_var.get().strip()
-        if not expr: return False
+        if not expr:
+            self.output.delete("1.0", tk.END)
+            self.output.insert(tk.END, "Shprehja (live): bosh\n")
+            return
+        # One worker at a time: a still-running (now stale) job is waited out, not stacked on
+        if self.live_thread is not None and self.live_thread.is_alive():
+            self.live_after_id = self.root.after(50, self.start_live)
+            return
+        raw = {k: e.get() for k, e in self.set_entries.items()}
+        gen = self.live_generation
+        self.live_thread = threading.Thread(target=self.live_worker, args=(gen, expr, raw), daemon=True)
+        self.live_thread.start()
+        self.root.after(50, self.poll_live)
+
+    def live_parse(self, raw: Dict[str, str]) -> Dict[str, frozenset]:
+        """Keeps only the last raw text and its parsed set per label: unchanged entries are
+        not re-split, and old keystrokes do not pin full copies in memory."""
+        sets = {}
+        for k, v in raw.items():
+            cached = self.live_parsed.get(k)
+            if cached is None or cached[0] != v:
+                cached = (v, frozenset(parse_set_input(v)))
+                self.live_parsed[k] = cached
+            sets[k] = cached[1]
+        return sets
+
+    def live_worker(self, gen: int, expr: str, raw: Dict[str, str]):
+        """Runs off the Tk thread; results are handed back through live_queue."""
+        cancelled = lambda: gen != self.live_generation
         try:
-            res = evaluate_expression(expr, test_sets)
-            return "x" in res
-        except: return False
+            sets = self.live_parse(raw)
+            if cancelled():
+                return
+            # Keyed on the raw texts, so cache keys do not hold extra parsed copies
+            key = (expr, tuple(raw.items()))
+            res = self.live_cache.pop(key, None)
+            if res is None:
+                res = evaluate_bounded(expr, sets, self.limits, cancelled=cancelled)
+            # Small LRU; results too large for their share of the memory budget are not kept
+            if len(res.elements) * BYTES_PER_ELEMENT <= self.limits.max_bytes // LIVE_CACHE_SIZE:
+                if len(self.live_cache) >= LIVE_CACHE_SIZE:
+                    self.live_cache.pop(next(iter(self.live_cache)))
+                self.live_cache[key] = res
+            if cancelled():
+                return
+            if res.is_full:
+                deadline = time.monotonic() + self.limits.max_seconds
+                rows, cut = first_rows(list(sets.values()), LIVE_PREVIEW_ROWS, deadline, cancelled)
+            else:
+                # The streamed pass already kept a sorted page: no new scan
+                rows, cut = sorted(res.elements)[:LIVE_PREVIEW_ROWS], False
+            preview = build_membership_table(sets, res.elements, rows=rows,
+                                             regions=None if res.is_full else res.regions)
+            more = cut or len(rows) >= LIVE_PREVIEW_ROWS
+            # Only needed to tell whether an open Venn diagram still shows these sets
+            digest = sets_digest(sets) if self.venn_canvas is not None else None
+            self.live_queue.put((gen, expr, sets, res, preview, more, digest, None))
+        except EvaluationCancelled:
+            return
+        except Exception as e:
+            self.live_queue.put((gen, expr, None, None, None, False, None, e))
+
+    def poll_live(self):
+        # Drain the queue, dropping results of stale generations
+        item = None
+        while True:
+            try:
+                msg = self.live_queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == self.live_generation:
+                item = msg
+        if item is None:
+            if self.live_var.get() and self.live_after_id is None:
+                self.root.after(50, self.poll_live)
+            return
+
+        gen, expr, sets, res, preview, more, digest, err = item
+
+        self.output.delete("1.0", tk.END)
+        if err is not None:
+            self.output.insert(tk.END, f"Shprehja:\n{expr}\n\nGabim: {err}\n")
+            return
+
+        self.current_sets = dict(sets)
+        self.current_eval = res
+        self.current_result = res.elements
+        self.current_digest = digest
+
+        self.output.insert(tk.END, f"Shprehja (live):\n{expr}\n\n")
+        self.output.insert(tk.END, f"|R| = {res.count_text()}\n")
+        for note in res.notes:
+            self.output.insert(tk.END, f"Kujdes: {note}\n")
+        self.output.insert(tk.END, f"Rajonet aktive: {', '.join(res.regions) if res.regions else '-'}\n\n")
+        self.output.insert(tk.END, preview)
+        if self.venn_canvas is not None:
+            if digest == self.venn_key:
+                update_venn_expression(self.venn_state, expr)
+            else:
+                mark_venn_stale(self.venn_state)
+            self.venn_canvas.draw_idle()
+        if more:
+            self.output.insert(tk.END, "\n... (shtyp Llogarit për tabelën e plotë)\n")
 
     # ------------------ VENN ------------------
     def draw_venn(self):
@@ -226,150 +1057,43 @@ class SetApp:
         if not self.current_sets:
             self.compute()
 
-        n = len(self.current_sets)
-        plt.close('all') # Clear previous plots
-
-        # -------- 2 BASHKËSI --------
-        if n == 2:
-            labels_list = ["A", "B"]
-            A, B = self.current_sets["A"], self.current_sets["B"]
-            plt.figure(figsize=(8, 7))
-            v = venn2([A, B], set_labels=labels_list)
-            
-            regions_map = {"10": A - B, "01": B - A, "11": A & B}
-            for rid, elems in regions_map.items():
-                patch = v.get_patch_by_id(rid)
-                label = v.get_label_by_id(rid)
-                if label: label.set_text("\n".join(sorted(elems)) if elems else "")
-                is_active = self.evaluate_symbolic(rid, labels_list)
-                if patch:
-                    patch.set_alpha(0.8 if is_active else 0.2)
-                    if is_active:
-                        patch.set_edgecolor('black')
-                        patch.set_linewidth(2)
-
-            plt.title(f"Diagrami i Vennit (2 bashkësi):\n{self.expr_var.get()}", pad=20)
-            plt.show()
-            return
+        # matplotlib-venn expects plain sets, also when compact storage is active
+        venn_sets = {k: set(v) for k, v in self.current_sets.items()}
+        expr = self.expr_var.get().strip()
 
-        # -------- 3 BASHKËSI --------
-        if n == 3:
-            labels_list = ["A", "B", "C"]
-            A, B, C = (self.current_sets[l] for l in labels_list)
-            plt.figure(figsize=(9, 8))
-            v = venn3([A, B, C], set_labels=labels_list)
-            
-            universe = set().union(A, B, C)
-            regions_ids = ["100", "010", "110", "001", "101", "011", "111"]
-            for rid in regions_ids:
-                patch = v.get_patch_by_id(rid)
-                label = v.get_label_by_id(rid)
-                
-                # Calculate precise region elements
-                curr = universe.copy()
-                for i, bit in enumerate(rid):
-                    s = self.current_sets[labels_list[i]]
-                    curr = (curr & s) if bit == '1' else (curr - s)
-                
-                if label: label.set_text("\n".join(sorted(curr)) if curr else "")
-                is_active = self.evaluate_symbolic(rid, labels_list)
-                if patch:
-                    patch.set_alpha(0.8 if is_active else 0.2)
-                    if is_active:
-                        patch.set_edgecolor('black')
-                        patch.set_linewidth(2)
-
-            plt.title(f"Diagrami i Vennit (3 bashkësi):\n{self.expr_var.get()}", pad=20)
-            plt.show()
+        if self.venn_canvas is None:
+            self.venn_figure = Figure(figsize=(6, 6))
+            self.venn_canvas = FigureCanvasTkAgg(self.venn_figure, master=self.venn_frame)
+            self.venn_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self.venn_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+
+        # Same sets: only the highlights and the title change
+        key = self.sets_key()
+        if key == self.venn_key:
+            update_venn_expression(self.venn_state, expr)
+        else:
+            self.venn_figure.clear()
+            self.venn_state = draw_venn_figure(self.venn_figure, venn_sets, expr)
+            self.venn_key = key
+        self.venn_canvas.draw_idle()
+
+    def export_venn(self):
+        if not HAS_VENN:
+            messagebox.showinfo("Venn", "matplotlib-venn mungon")
             return
-
-        # -------- 4 BASHKËSI (SHADED AREAS) --------
-        if n == 4:
-            import numpy as np
-            from matplotlib.patches import Ellipse
-            labels_list = ["A", "B", "C", "D"]
-            sets_data = [self.current_sets[l] for l in labels_list]
-            universe = set().union(*sets_data)
-
-            # High-res grid for pixel-perfect shading of complex operations
-            res = 400
-            gx = np.linspace(0, 10, res)
-            gy = np.linspace(0, 10, res)
-            X, Y = np.meshgrid(gx, gy)
-
-            # Ellipse definitions
-            ell_params = [
-                ((4.0, 5.0), 3.8, 7.8, 35),  # A
-                ((6.0, 5.0), 3.8, 7.8, -35), # B
-                ((4.0, 5.8), 3.8, 7.8, 35),  # C
-                ((6.0, 5.8), 3.8, 7.8, -35)  # D
-            ]
-
-            def get_mask(X, Y, center, w, h, angle_deg):
-                ang = np.radians(angle_deg)
-                cx, cy = center
-                a, b = w/2, h/2
-                dx, dy = X - cx, Y - cy
-                rx = dx * np.cos(ang) + dy * np.sin(ang)
-                ry = -dx * np.sin(ang) + dy * np.cos(ang)
-                return (rx**2 / a**2 + ry**2 / b**2) <= 1
-
-            masks = {labels_list[i]: get_mask(X, Y, *p) for i, p in enumerate(ell_params)}
-
-            # Evaluate the set expression on the bitmasks
-            expr_val = self.expr_var.get().strip()
-            # Convert expression to numpy-compatible bitwise logic
-            # Union: |, Intersection: &, SymDiff: ^, Diff: \ -> & ~
-            clean_expr = expr_val.replace("∪", "|").replace("∩", "&").replace("Δ", "^").replace("\\", "& ~")
-            for k in masks:
-                clean_expr = re.sub(rf"\b{k}\b", f"masks['{k}']", clean_expr)
-            
-            try:
-                result_mask = eval(clean_expr)
-            except:
-                result_mask = np.zeros_like(X, dtype=bool)
-
-            fig, ax = plt.subplots(figsize=(10, 10))
-            ax.set_xlim(0, 10); ax.set_ylim(0, 10); ax.set_aspect('equal')
-            ax.axis('off')
-
-            # Shade the resulting union/intersection area in Gold
-            if np.any(result_mask):
-                ax.contourf(X, Y, result_mask, levels=[0.5, 1.5], colors=['#FFD700'], alpha=0.5)
-
-            # Draw set outlines
-            colors = ['#ff4d4d', '#4dff4d', '#4d4dff', '#ffb347']
-            for i, p in enumerate(ell_params):
-                # Light fill
-                ax.add_patch(Ellipse(p[0], p[1], p[2], angle=p[3], fc=colors[i], alpha=0.1))
-                # Thick border
-                ax.add_patch(Ellipse(p[0], p[1], p[2], angle=p[3], ec=colors[i], fc='none', lw=2.5, zorder=10))
-
-            # Color-coded Legend at the top left
-            for i, l in enumerate(labels_list):
-                members = sorted(list(self.current_sets[l]))
-                ax.text(0.2, 9.8 - i*0.4, f"Bashkësia {l}: {members}", 
-                        color=colors[i], weight='bold', fontsize=9, ha='left', transform=ax.transData)
-
-            # Region Markers (Gold buttons for result-active areas)
-            centers = {
-                "1000": (1.8, 3.8), "0100": (8.2, 3.8), "0010": (1.8, 7.2), "0001": (8.2, 7.2),
-                "1100": (5.0, 1.8), "1010": (3.1, 5.5), "0101": (6.9, 5.5), "0011": (5.0, 9.2),
-                "1001": (4.3, 4.2), "0110": (5.7, 4.2), "1110": (3.8, 3.0), "1101": (6.2, 3.0),
-                "1011": (3.8, 8.0), "0111": (6.2, 8.0), "1111": (5.0, 5.5)
-            }
-
-            for bits, pos in centers.items():
-                if self.evaluate_symbolic(bits, labels_list):
-                    ax.plot(pos[0], pos[1], 'o', color='gold', markersize=14, markeredgecolor='black', zorder=15)
-                    ax.text(pos[0], pos[1], "R", ha='center', va='center', weight='bold', fontsize=8, zorder=16)
-
-            plt.title(f"Rezultati i Shprehjes: {expr_val}", fontsize=14, pad=40)
-            plt.show()
+        if not self.current_sets:
+            self.compute()
+        path = filedialog.asksaveasfilename(
+            defaultextension=".png", filetypes=[("PNG", "*.png"), ("SVG", "*.svg")]
+        )
+        if not path:
             return
+        try:
+            save_venn_image(path, self.current_sets, self.expr_var.get().strip())
+        except Exception as e:
+            messagebox.showerror("Gabim Venn", str(e))
 
 
-        
     # ------------------ METRICS ------------------
     def get_code_metrics(self, file_path):
         """Runs radon and pylint, returns tuple: (report_str, metrics_dict)."""
@@ -484,13 +1208,17 @@ class SetApp:
                 f.write(self.output.get("1.0", tk.END))
 
     def export_csv(self):
+        if self.current_eval is not None and not self.current_eval.is_full:
+            messagebox.showwarning(
+                "CSV", "Rezultati R nuk është i plotë (kufizim burimesh); CSV nuk u eksportua.")
+            return
         path = filedialog.asksaveasfilename(defaultextension=".csv")
         if not path:
             return
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(["Element"] + list(self.current_sets.keys()) + ["R"])
-            universe = set().union(*self.current_sets.values()) | self.current_result
+            universe = set().union(*self.current_sets.values(), self.current_result)
             for el in sorted(universe):
                 row = [el]
                 for k in self.current_sets:
@@ -521,12 +1249,34 @@ class SetApp:
             title = Paragraph("Projekt inteligjent për bashkësi", styles['Title'])
             story.append(title)
             story.append(Spacer(1, 12))
+            if self.current_eval is not None and not self.current_eval.is_full:
+                story.append(Paragraph(
+                    f"<b>Kujdes:</b> rezultati R nuk është i plotë (|R| = {self.current_eval.count_text()}); "
+                    "shih shënimet më poshtë.", styles['Normal']))
+                story.append(Spacer(1, 12))
 
             # Use Preformatted for the set results/tables to keep alignment
             content_text = self.output.get("1.0", tk.END)
             # A simple monospace style
             code_style = styles['Code']
             story.append(Preformatted(content_text, code_style))
+
+            # Venn diagram from the headless render cache
+            expr = self.expr_var.get().strip()
+            if HAS_VENN and self.current_eval is not None and not self.current_eval.is_full:
+                story.append(Spacer(1, 12))
+                story.append(Paragraph("Diagrami i Vennit u anashkalua: rezultati R nuk është i plotë.",
+                                       styles['Normal']))
+            elif HAS_VENN and self.current_sets and expr:
+                try:
+                    from reportlab.platypus import Image
+                    fw, fh = VENN_FIGSIZE[len(self.current_sets)]
+                    png = render_venn_image(self.current_sets, expr, "png", digest=self.sets_key())
+                    story.append(Spacer(1, 12))
+                    story.append(Image(io.BytesIO(png), width=150 * mm, height=150 * mm * fh / fw))
+                except Exception as e_venn:
+                    story.append(Spacer(1, 12))
+                    story.append(Paragraph(f"Error generating Venn diagram: {str(e_venn)}", styles['Normal']))
             
             # 2. Append Dynamic Metrics Content
             try: